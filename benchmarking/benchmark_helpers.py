@@ -2,21 +2,47 @@ import sys
 
 sys.path.append("..")
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
+import torch
 
-from helper_functions.schedules import Full_Horizon_Schedule, calculate_traveled_distance
+from helper_functions.schedules import (
+    Full_Horizon_Schedule,
+    calculate_traveled_distance,
+    calculate_worst_case_makespan,
+)
 from schedulers.initialize_schedulers import create_scheduler
-from schedulers.sadcher import SadcherScheduler
+from schedulers.sadcher import (
+    SadcherScheduler,
+    load_checkpoint_state_dict,
+    register_checkpoint_state_dict,
+)
 from schedulers.sadcherRL import RLSadcherScheduler
 from simulation_environment.simulator_2D import Simulation
 
+# Seeds for stochastic worker runs come from their own stream -> the global NumPy RNG, which
+# generates the problem instances, is left untouched
+_WORKER_SEED_SEQUENCE = np.random.SeedSequence(0)
+
+# Torch threads for every timed simulation run, in pool workers and in the main process alike
+# -> decision times of deterministic and stochastic schedulers stay comparable
+SIMULATION_TORCH_THREADS = 1
+
 
 def run_one_simulation(
-    problem_instance, scheduler_name, checkpoint_path, sampling=False, worst_case_makespan=None
+    problem_instance,
+    scheduler_name,
+    checkpoint_path,
+    sampling=False,
+    worst_case_makespan=None,
+    compile_model=False,
+    use_bf16=False,
 ):
     # RL models do not use idle, as they allow for direct assignment to tasks that can"t be exectued yet
     use_idle = not scheduler_name.startswith("rl_sadcher")
+    if worst_case_makespan is None:
+        worst_case_makespan = calculate_worst_case_makespan(problem_instance)
     sim = Simulation(problem_instance, scheduler_name, use_idle=use_idle)
 
     scheduler = create_scheduler(
@@ -25,12 +51,20 @@ def run_one_simulation(
         duration_normalization=sim.duration_normalization,
         location_normalization=sim.location_normalization,
         stddev=0.5,
+        compile_model=compile_model,
+        use_bf16=use_bf16,
     )
 
+    if compile_model and isinstance(scheduler, SadcherScheduler):
+        # Untimed warm-up forward at the instance's shapes -> compiles for new shapes only
+        scheduler.predict_reward(sim)
+
     feasible = True
-    duration_per_decision = []
+    # Every decision advances at least one timestep -> at most ~worst_case_makespan decisions
+    decision_times_ns = np.empty(int(worst_case_makespan) + 8, dtype=np.int64)
+    n_decisions = 0
     while not sim.sim_done:
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         filter_triggered = False
 
         if isinstance(scheduler, SadcherScheduler):
@@ -45,7 +79,10 @@ def run_one_simulation(
         else:
             instantaneous_schedule = scheduler.calculate_robot_assignment(sim)
 
-        duration_per_decision.append(time.time() - start_time)
+        if n_decisions == len(decision_times_ns):
+            decision_times_ns = np.resize(decision_times_ns, 2 * len(decision_times_ns))
+        decision_times_ns[n_decisions] = time.perf_counter_ns() - start_time
+        n_decisions += 1
         sim.assign_tasks_to_robots(instantaneous_schedule)
         sim.step_until_next_decision_point(filter_triggered=filter_triggered)
 
@@ -56,10 +93,63 @@ def run_one_simulation(
 
     n_tasks = len(problem_instance["T_e"])
     schedule = Full_Horizon_Schedule(sim.makespan, sim.robot_schedules, n_tasks)
+    duration_per_decision = decision_times_ns[:n_decisions].astype(np.float64) * 1e-9  # seconds
 
     return sim.makespan, feasible, duration_per_decision, schedule
 
 
+def init_simulation_worker(checkpoint_state_dicts):
+    # Few torch threads per worker -> parallel runs do not oversubscribe the cores
+    torch.set_num_threads(SIMULATION_TORCH_THREADS)
+    for checkpoint_path, checkpoint_state_dict in checkpoint_state_dicts.items():
+        register_checkpoint_state_dict(checkpoint_path, checkpoint_state_dict)
+    if torch.cuda.is_available():
+        # Set up the CUDA context and cuBLAS once per worker, outside the timed decisions
+        torch.ones(1, 1, device="cuda") @ torch.ones(1, 1, device="cuda")
+
+
+def create_simulation_pool(n_workers, checkpoint_paths):
+    """
+    Worker pool for stochastic simulation runs, to be created once per benchmark.
+    Checkpoints are loaded once onto the CPU and handed to the workers as state dicts.
+    """
+    checkpoint_state_dicts = {
+        path: load_checkpoint_state_dict(path) for path in set(checkpoint_paths) if path
+    }
+    # CUDA can not be re-initialized in forked processes
+    mp_context = torch.multiprocessing.get_context("spawn") if torch.cuda.is_available() else None
+    return ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=mp_context,
+        initializer=init_simulation_worker,
+        initargs=(checkpoint_state_dicts,),
+    )
+
+
+def run_one_seeded_simulation(
+    problem_instance,
+    scheduler_name,
+    checkpoint_path,
+    sampling,
+    worst_case_makespan,
+    compile_model,
+    use_bf16,
+    seed,
+):
+    # Worker processes inherit the parent's RNG state -> reseed so stochastic runs differ
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    return run_one_simulation(
+        problem_instance,
+        scheduler_name,
+        checkpoint_path,
+        sampling=sampling,
+        worst_case_makespan=worst_case_makespan,
+        compile_model=compile_model,
+        use_bf16=use_bf16,
+    )
+
+
 def evaluate_scheduler_in_simulation(
     scheduler_name,
     problem_instance,
@@ -67,31 +157,66 @@ def evaluate_scheduler_in_simulation(
     n_runs=1,
     sampling=False,
     worst_case_makespan=None,
+    simulation_pool=None,
+    compile_model=False,
+    use_bf16=False,
 ):
     all_makespans = []
     times_per_decision = []
     all_feasible = []
     all_distances = []
 
-    for _ in range(n_runs):
-        makespan, feasible, times_per_decision, schedule = run_one_simulation(
-            problem_instance,
-            scheduler_name,
-            checkpoint_map[scheduler_name],
-            sampling=sampling,
-            worst_case_makespan=worst_case_makespan,
+    # Computed once per instance and shared by all (stochastic) runs
+    if worst_case_makespan is None:
+        worst_case_makespan = calculate_worst_case_makespan(problem_instance)
+
+    if n_runs == 1 or simulation_pool is None:
+        # Same thread setting as the pool workers, restored afterwards for the other baselines
+        n_torch_threads = torch.get_num_threads()
+        torch.set_num_threads(SIMULATION_TORCH_THREADS)
+        try:
+            run_results = [
+                run_one_simulation(
+                    problem_instance,
+                    scheduler_name,
+                    checkpoint_map[scheduler_name],
+                    sampling=sampling,
+                    worst_case_makespan=worst_case_makespan,
+                    compile_model=compile_model,
+                    use_bf16=use_bf16,
+                )
+                for _ in range(n_runs)
+            ]
+        finally:
+            torch.set_num_threads(n_torch_threads)
+    else:
+        # Stochastic runs are independent -> run them in the shared worker pool
+        seeds = [int(seq.generate_state(1)[0]) for seq in _WORKER_SEED_SEQUENCE.spawn(n_runs)]
+        run_results = list(
+            simulation_pool.map(
+                run_one_seeded_simulation,
+                [problem_instance] * n_runs,
+                [scheduler_name] * n_runs,
+                [checkpoint_map[scheduler_name]] * n_runs,
+                [sampling] * n_runs,
+                [worst_case_makespan] * n_runs,
+                [compile_model] * n_runs,
+                [use_bf16] * n_runs,
+                seeds,
+            )
         )
 
+    for makespan, feasible, run_times_per_decision, schedule in run_results:
         all_makespans.append(makespan)
         all_feasible.append(feasible)
-        times_per_decision.extend(times_per_decision)
+        times_per_decision.extend(run_times_per_decision)
         all_distances.append(calculate_traveled_distance(schedule, problem_instance["T_t"]))
 
     best_run = np.argmin(all_makespans)
     best_makespan = all_makespans[best_run]
     best_distance = all_distances[best_run]
     avg_time_per_decision = np.mean(times_per_decision)
-    total_time_solution = np.sum(times_per_decision) * n_runs  # total time for all runs
+    total_time_solution = np.sum(times_per_decision)  # total time for all runs
     feasible = any(all_feasible)
 
     return (
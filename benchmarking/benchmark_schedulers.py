@@ -1,8 +1,10 @@
 import argparse
+import os
 import pickle
 import signal
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import torch
@@ -17,12 +19,13 @@ from baselines.heteromrta.parameters import EnvParams, TrainParams
 from baselines.heteromrta.worker import Worker
 from benchmarking.benchmark_helpers import (
     EpisodeTimeout,
+    create_simulation_pool,
     evaluate_scheduler_in_simulation,
     get_scheduler_names,
     timeout_handler,
 )
 from data_generation.problem_generator import generate_random_data_with_precedence
-from helper_functions.schedules import calculate_traveled_distance
+from helper_functions.schedules import calculate_traveled_distance, calculate_worst_case_makespan
 from visualizations.benchmark_visualizations import plot_results, print_final_results
 
 """
@@ -52,6 +55,7 @@ N_ROBOTS = 3
 N_SKILLS = 3
 N_PRECEDENCE = 3
 N_STOCHASTIC_RUNS = 10
+MILP_THREADS = 2
 GRID_SIZE = 100
 DURATION_FACTOR = 100 / 5
 MAKESPAN_FACTOR = 20
@@ -80,6 +84,15 @@ CHECKPOINT_MAP = {
 }
 
 
+def timed_milp_scheduling(problem_instance, n_threads, cutoff_time_seconds):
+    # Timed inside the worker -> solve time excludes waiting for the other schedulers
+    start_time = time.time()
+    optimal_schedule = milp_scheduling(
+        problem_instance, n_threads=n_threads, cutoff_time_seconds=cutoff_time_seconds
+    )
+    return optimal_schedule, time.time() - start_time
+
+
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("--include_milp", action="store_true", default=False)
@@ -87,6 +100,8 @@ def parse_args():
     parser.add_argument("--include_RL_sadcher", action="store_true", default=False)
     parser.add_argument("--include_heteromrta", action="store_true", default=False)
     parser.add_argument("--n_iterations", type=int, default=50)
+    parser.add_argument("--compile_model", action="store_true", default=False)
+    parser.add_argument("--use_bf16", action="store_true", default=False)
     return parser.parse_args()
 
 
@@ -106,150 +121,167 @@ if __name__ == "__main__":
     computation_times_full_solution = {scheduler: [] for scheduler in scheduler_names}
     feasibility = {scheduler: [] for scheduler in scheduler_names}
 
-    for iteration in tqdm(range(args.n_iterations)):
-        problem_instance = generate_random_data_with_precedence(
-            N_TASKS, N_ROBOTS, N_SKILLS, N_PRECEDENCE
-        )
-        worst_case_makespan = np.sum(problem_instance["T_e"]) + np.sum(
-            [np.max(problem_instance["T_t"][task]) for task in range(len(problem_instance["T_e"]))]
-        )
+    # MILP solves in the background with its own solver threads -> keep those cores free
+    n_milp_threads = MILP_THREADS if "milp" in scheduler_names else 0
+    n_simulation_workers = max(1, min(N_STOCHASTIC_RUNS, (os.cpu_count() or 1) - n_milp_threads))
+    stochastic_checkpoints = [
+        CHECKPOINT_MAP[s] for s in scheduler_names if s in SCHEDULERS_WITH_SAMPLING
+    ]
+    with (
+        ProcessPoolExecutor(max_workers=1) as milp_executor,
+        create_simulation_pool(n_simulation_workers, stochastic_checkpoints) as simulation_pool,
+    ):
+        for iteration in tqdm(range(args.n_iterations)):
+            problem_instance = generate_random_data_with_precedence(
+                N_TASKS, N_ROBOTS, N_SKILLS, N_PRECEDENCE
+            )
+            worst_case_makespan = calculate_worst_case_makespan(problem_instance)
 
-        for scheduler_name in scheduler_names:
-            # MILP does not need simulation
-            if scheduler_name == "milp":
-                start_time = time.time()
-                optimal_schedule = milp_scheduling(
-                    problem_instance, n_threads=2, cutoff_time_seconds=60 * 15
+            # MILP does not need simulation -> solve it in the background while the others run
+            milp_future = None
+            if "milp" in scheduler_names:
+                milp_future = milp_executor.submit(
+                    timed_milp_scheduling, problem_instance, MILP_THREADS, 60 * 15
                 )
+
+            for scheduler_name in scheduler_names:
+                if scheduler_name == "milp":
+                    continue  # collected after the other schedulers
+
+                # HeteroMRTA runs
+                if scheduler_name in {"heteromrta", "heteromrta_sampling"}:
+                    t_start = time.time()
+                    # load network once per iteration
+                    env: TaskEnv = problem_to_taskenv(problem_instance, GRID_SIZE, DURATION_FACTOR)
+                    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+                    net = AttentionNet(
+                        TrainParams.AGENT_INPUT_DIM,
+                        TrainParams.TASK_INPUT_DIM,
+                        TrainParams.EMBEDDING_DIM,
+                    ).to(device)
+                    ckpt = torch.load(CHECKPOINT_HETEROMRTA, map_location=device)
+                    net.load_state_dict(ckpt["best_model"])
+                    worker = Worker(0, net, net, 0, device)
+
+                    best_ms = float("inf")
+                    best_travel_distance = float("inf")
+                    best_comp_time_per_decision = float("inf")
+                    found_feasible = False
+                    sampling_runs = 1 if scheduler_name == "heteromrta" else N_STOCHASTIC_RUNS
+
+                    for run in range(sampling_runs):
+                        env.init_state()
+                        worker.env = env
+                        try:
+                            signal.signal(signal.SIGALRM, timeout_handler)
+                            signal.alarm(10)  # 10s to finish -> catch very rare infinite loops
+
+                            # run episode (sample only for heteromrta_sampling)
+                            _, _, res_temp = worker.run_episode(
+                                False,
+                                sample=(scheduler_name == "heteromrta_sampling"),
+                                max_waiting=False,
+                            )
+                            signal.alarm(0)  # cancel alarm on success
+
+                            # compute makespan, clamp by worst_case
+                            ms_temp = res_temp["makespan"][-1] * MAKESPAN_FACTOR
+                            feasible_temp = True
+                            if ms_temp > worst_case_makespan:
+                                ms_temp = worst_case_makespan
+                                feasible_temp = False
+
+                            # update best
+                            if ms_temp < best_ms:
+                                best_ms = ms_temp
+                                best_travel_distance = (
+                                    res_temp["travel_dist"][-1] * TRAVEL_DISTANCE_FACTOR
+                                )
+                                best_comp_time_per_decision = np.mean(res_temp["time_per_decision"])
+
+                            found_feasible = found_feasible or feasible_temp
+
+                        except Exception as e:
+                            if isinstance(e, EpisodeTimeout):
+                                print(f"  ⚠️  run {run} timed out → marking infeasible")
+                            else:
+                                print(f"  ⚠️  run {run} error ({e!r}) → marking infeasible")
+
+                            signal.alarm(0)
+                            best_ms = worst_case_makespan
+                            found_feasible = False
+                            break
+
+                    # store metrics for the single best run
+                    makespans[scheduler_name].append(best_ms)
+                    travel_distances[scheduler_name].append(best_travel_distance)
+                    computation_times_per_decision[scheduler_name].append(
+                        best_comp_time_per_decision
+                    )
+                    computation_times_full_solution[scheduler_name].append(time.time() - t_start)
+                    feasibility[scheduler_name].append(found_feasible)
+
+                # All other schedulers need our simulation
+                else:
+                    is_stochastic = scheduler_name in SCHEDULERS_WITH_SAMPLING
+                    n_runs = N_STOCHASTIC_RUNS if is_stochastic else 1
+                    sampling = is_stochastic
+
+                    best_ms, best_dist, avg_time, total_time, feasible = (
+                        evaluate_scheduler_in_simulation(
+                            scheduler_name,
+                            problem_instance,
+                            CHECKPOINT_MAP,
+                            n_runs,
+                            sampling,
+                            worst_case_makespan,
+                            simulation_pool=simulation_pool,
+                            compile_model=args.compile_model,
+                            use_bf16=args.use_bf16,
+                        )
+                    )
+
+                    makespans[scheduler_name].append(best_ms)
+                    travel_distances[scheduler_name].append(best_dist)
+                    computation_times_per_decision[scheduler_name].append(avg_time)
+                    computation_times_full_solution[scheduler_name].append(total_time)
+                    feasibility[scheduler_name].append(feasible)
+
+            if milp_future is not None:
+                optimal_schedule, time_full_solution = milp_future.result()
                 if optimal_schedule is None:
                     print("MILP could not find a solution within time limit.")
-                    makespans[scheduler_name].append(worst_case_makespan)
-                    travel_distances[scheduler_name].append(0)
-                    computation_times_per_decision[scheduler_name].append(0)
-                    computation_times_full_solution[scheduler_name].append(0)
-                    feasibility[scheduler_name].append(False)
-                    continue
-
-                time_full_solution = time.time() - start_time
-                # MILP can not return intermediate decisions -> both times are the same
-                computation_times_per_decision[scheduler_name].append(time_full_solution)
-                computation_times_full_solution[scheduler_name].append(time_full_solution)
-                makespans[scheduler_name].append(optimal_schedule.makespan)
-                travel_distance = calculate_traveled_distance(
-                    optimal_schedule, problem_instance["T_t"]
-                )
-                travel_distances[scheduler_name].append(travel_distance)
-                feasibility[scheduler_name].append(True)
-
-            # HeteroMRTA runs
-            elif scheduler_name in {"heteromrta", "heteromrta_sampling"}:
-                t_start = time.time()
-                # load network once per iteration
-                env: TaskEnv = problem_to_taskenv(problem_instance, GRID_SIZE, DURATION_FACTOR)
-                device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-                net = AttentionNet(
-                    TrainParams.AGENT_INPUT_DIM,
-                    TrainParams.TASK_INPUT_DIM,
-                    TrainParams.EMBEDDING_DIM,
-                ).to(device)
-                ckpt = torch.load(CHECKPOINT_HETEROMRTA, map_location=device)
-                net.load_state_dict(ckpt["best_model"])
-                worker = Worker(0, net, net, 0, device)
-
-                best_ms = float("inf")
-                best_travel_distance = float("inf")
-                best_comp_time_per_decision = float("inf")
-                found_feasible = False
-                sampling_runs = 1 if scheduler_name == "heteromrta" else N_STOCHASTIC_RUNS
-
-                for run in range(sampling_runs):
-                    env.init_state()
-                    worker.env = env
-                    try:
-                        signal.signal(signal.SIGALRM, timeout_handler)
-                        signal.alarm(10)  # 10s to finish -> catch very rare infinite loops
-
-                        # run episode (sample only for heteromrta_sampling)
-                        _, _, res_temp = worker.run_episode(
-                            False,
-                            sample=(scheduler_name == "heteromrta_sampling"),
-                            max_waiting=False,
-                        )
-                        signal.alarm(0)  # cancel alarm on success
-
-                        # compute makespan, clamp by worst_case
-                        ms_temp = res_temp["makespan"][-1] * MAKESPAN_FACTOR
-                        feasible_temp = True
-                        if ms_temp > worst_case_makespan:
-                            ms_temp = worst_case_makespan
-                            feasible_temp = False
-
-                        # update best
-                        if ms_temp < best_ms:
-                            best_ms = ms_temp
-                            best_travel_distance = (
-                                res_temp["travel_dist"][-1] * TRAVEL_DISTANCE_FACTOR
-                            )
-                            best_comp_time_per_decision = np.mean(res_temp["time_per_decision"])
-
-                        found_feasible = found_feasible or feasible_temp
-
-                    except Exception as e:
-                        if isinstance(e, EpisodeTimeout):
-                            print(f"  ⚠️  run {run} timed out → marking infeasible")
-                        else:
-                            print(f"  ⚠️  run {run} error ({e!r}) → marking infeasible")
-
-                        signal.alarm(0)
-                        best_ms = worst_case_makespan
-                        found_feasible = False
-                        break
-
-                # store metrics for the single best run
-                makespans[scheduler_name].append(best_ms)
-                travel_distances[scheduler_name].append(best_travel_distance)
-                computation_times_per_decision[scheduler_name].append(best_comp_time_per_decision)
-                computation_times_full_solution[scheduler_name].append(time.time() - t_start)
-                feasibility[scheduler_name].append(found_feasible)
-
-            # All other schedulers need our simulation
-            else:
-                is_stochastic = scheduler_name in SCHEDULERS_WITH_SAMPLING
-                n_runs = N_STOCHASTIC_RUNS if is_stochastic else 1
-                sampling = is_stochastic
-
-                best_ms, best_dist, avg_time, total_time, feasible = (
-                    evaluate_scheduler_in_simulation(
-                        scheduler_name,
-                        problem_instance,
-                        CHECKPOINT_MAP,
-                        n_runs,
-                        sampling,
-                        worst_case_makespan,
+                    makespans["milp"].append(worst_case_makespan)
+                    travel_distances["milp"].append(0)
+                    computation_times_per_decision["milp"].append(0)
+                    computation_times_full_solution["milp"].append(0)
+                    feasibility["milp"].append(False)
+                else:
+                    # MILP can not return intermediate decisions -> both times are the same
+                    computation_times_per_decision["milp"].append(time_full_solution)
+                    computation_times_full_solution["milp"].append(time_full_solution)
+                    makespans["milp"].append(optimal_schedule.makespan)
+                    travel_distance = calculate_traveled_distance(
+                        optimal_schedule, problem_instance["T_t"]
                     )
+                    travel_distances["milp"].append(travel_distance)
+                    feasibility["milp"].append(True)
+
+            iteration_results = sorted((makespans[s][-1], s) for s in scheduler_names)
+
+            with open(f"benchmark_results_{SEED}.pkl", "wb") as f:
+                pickle.dump(
+                    {
+                        "makespans": makespans,
+                        "travel_distances": travel_distances,
+                        "computation_times_per_decision": computation_times_per_decision,
+                        "computation_times_full_solution": computation_times_full_solution,
+                        "feasibility": feasibility,
+                        "scheduler_names": scheduler_names,
+                    },
+                    f,
                 )
 
-                makespans[scheduler_name].append(best_ms)
-                travel_distances[scheduler_name].append(best_dist)
-                computation_times_per_decision[scheduler_name].append(avg_time)
-                computation_times_full_solution[scheduler_name].append(total_time)
-                feasibility[scheduler_name].append(feasible)
-
-        iteration_results = sorted((makespans[s][-1], s) for s in scheduler_names)
-
-        with open(f"benchmark_results_{SEED}.pkl", "wb") as f:
-            pickle.dump(
-                {
-                    "makespans": makespans,
-                    "travel_distances": travel_distances,
-                    "computation_times_per_decision": computation_times_per_decision,
-                    "computation_times_full_solution": computation_times_full_solution,
-                    "feasibility": feasibility,
-                    "scheduler_names": scheduler_names,
-                },
-                f,
-            )
-
     print_final_results(
         scheduler_names,
         args.n_iterations,
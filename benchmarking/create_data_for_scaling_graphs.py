@@ -20,12 +20,13 @@ from baselines.heteromrta.parameters import EnvParams, TrainParams
 from baselines.heteromrta.worker import Worker
 from benchmarking.benchmark_helpers import (
     EpisodeTimeout,
+    create_simulation_pool,
     evaluate_scheduler_in_simulation,
     get_scheduler_names,
     timeout_handler,
 )
 from data_generation.problem_generator import generate_random_data_with_precedence
-from helper_functions.schedules import calculate_traveled_distance
+from helper_functions.schedules import calculate_traveled_distance, calculate_worst_case_makespan
 from visualizations.benchmark_visualizations import plot_results, print_final_results
 
 N_SKILLS = 3
@@ -97,8 +98,16 @@ def main():
         * args.n_runs
     )
 
+    n_simulation_workers = min(N_STOCHASTIC_RUNS, os.cpu_count() or 1)
+    stochastic_checkpoints = [
+        CHECKPOINT_MAP[s] for s in scheduler_names if s in SCHEDULERS_WITH_SAMPLING
+    ]
+
     pbar = tqdm(total=total_iterations, desc="Running configurations")
-    with open(args.output_file, "a") as outfile:
+    with (
+        open(args.output_file, "a") as outfile,
+        create_simulation_pool(n_simulation_workers, stochastic_checkpoints) as simulation_pool,
+    ):
         for run in range(args.n_runs):
             for n_tasks in range(args.min_tasks, args.max_tasks + 1, args.step_tasks):
                 for n_robots in range(args.min_robots, args.max_robots + 1, args.step_robots):
@@ -110,8 +119,8 @@ def main():
                     problem_instance = generate_random_data_with_precedence(
                         n_tasks, n_robots, N_SKILLS, N_PRECEDENCE
                     )
-                    worst_case_makespan = np.sum(problem_instance["T_e"]) + np.sum(
-                        [np.max(problem_instance["T_t"][task]) for task in range(n_tasks + 1)]
+                    worst_case_makespan = calculate_worst_case_makespan(
+                        problem_instance, n_rows=n_tasks + 1
                     )
 
                     for scheduler_name in scheduler_names:
@@ -234,6 +243,7 @@ def main():
                                     n_runs,
                                     sampling,
                                     worst_case_makespan,
+                                    simulation_pool=simulation_pool,
                                 )
                             )
 
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class Full_Horizon_Schedule:
     """
     Represents a solution to the scheduling problem.
@@ -126,3 +129,13 @@ def calculate_traveled_distance(schedule: Full_Horizon_Schedule, travel_times):
             total_distance += distance
 
     return total_distance
+
+
+def calculate_worst_case_makespan(problem_instance, n_rows=None):
+    # Sum of all execution times plus the longest outgoing travel from each task
+    # n_rows restricts which rows of T_t are considered (default: all tasks)
+    T_e = np.asarray(problem_instance["T_e"])
+    T_t = np.ascontiguousarray(problem_instance["T_t"])
+    if n_rows is None:
+        n_rows = len(T_e)
+    return float(T_e.sum() + T_t[:n_rows].max(axis=1).sum())
@@ -13,7 +13,7 @@ from data_generation.problem_generator import (
     generate_random_data_all_robots_all_skills,
     generate_random_data_with_precedence,
 )
-from helper_functions.schedules import Instantaneous_Schedule
+from helper_functions.schedules import Instantaneous_Schedule, calculate_worst_case_makespan
 from schedulers.bipartite_matching import CachedBipartiteMatcher
 from schedulers.filtering_assignments import (
     filter_overassignments,
@@ -102,8 +102,8 @@ class ContinuousSchedulingRLEnvironment(gym.Env):
         self.bipartite_matcher = CachedBipartiteMatcher(self.sim)
 
         self.greedy_makespan = greedy_scheduling(self.problem_instance, print_flag=False).makespan
-        self.worst_case_makespan = np.sum(self.problem_instance["T_e"]) + np.sum(
-            [np.max(self.problem_instance["T_t"][task]) for task in range(self.n_tasks + 1)]
+        self.worst_case_makespan = calculate_worst_case_makespan(
+            self.problem_instance, n_rows=self.n_tasks + 1
         )
 
         available_robot_mask = np.array([robot.available for robot in self.sim.robots], dtype=bool)
@@ -227,7 +227,7 @@ class ContinuousSchedulingRLEnvironment(gym.Env):
             )
 
             bipartite_matching_solution = self.bipartite_matcher.solve(
-                predicted_reward, n_threads=1, gap=0.0
+                predicted_reward, self.sim, n_threads=1, gap=0.0
             )
 
             filtered_solution = filter_redundant_assignments(bipartite_matching_solution, self.sim)
@@ -13,7 +13,7 @@ from data_generation.problem_generator import (
     generate_random_data_all_robots_all_skills,
     generate_random_data_with_precedence,
 )
-from helper_functions.schedules import Instantaneous_Schedule
+from helper_functions.schedules import Instantaneous_Schedule, calculate_worst_case_makespan
 from schedulers.filtering_assignments import (
     filter_overassignments,
     filter_redundant_assignments,
@@ -104,8 +104,8 @@ class SchedulingRLEnvironment(gym.Env):
         )
 
         self.greedy_makespan = greedy_scheduling(self.problem_instance, print_flag=False).makespan
-        self.worst_case_makespan = np.sum(self.problem_instance["T_e"]) + np.sum(
-            [np.max(self.problem_instance["T_t"][task]) for task in range(self.n_tasks + 1)]
+        self.worst_case_makespan = calculate_worst_case_makespan(
+            self.problem_instance, n_rows=self.n_tasks + 1
         )
 
         return self._get_observation(), {}
@@ -1,6 +1,10 @@
+import numpy as np
 import pulp
 import torch
 
+SOLUTION_CACHE_SIZE = 1024
+SOLUTION_CACHE_DECIMALS = 3
+
 
 class CachedBipartiteMatcher:
     def __init__(self, sim):
@@ -9,12 +13,13 @@ class CachedBipartiteMatcher:
          – variables  A[i][j], X[j]
          – linking & capability constraints for every task
         (availability & readiness go into solve())
+        Only the static structure is kept, the simulation itself is not referenced afterwards.
         """
-        self.sim = sim
         self.n_robots = len(sim.robots)
         self.n_tasks = len(sim.tasks)
         self.n_skills = len(sim.robots[0].capabilities)
         self.M = self.n_robots
+        self.solution_cache = {}  # (rounded reward, dynamic constraints, gap) -> solution
 
         # 1) create vars
         self.A = pulp.LpVariable.dicts(
@@ -50,15 +55,30 @@ class CachedBipartiteMatcher:
                         >= req * self.X[j]
                     )
 
-    def solve(self, R: torch.Tensor, n_threads: int = 6, gap: float = 0.02):
+    def solve(self, R: torch.Tensor, sim, n_threads: int = 6, gap: float = 0.02):
         """
         Copy template, add dynamic constraints & objective, solve.
         R: torch.Tensor [n_robots, n_tasks]
+        sim: simulation providing the dynamic state (any simulation of the problem instance the
+             template was built for)
         """
+        # Nearly identical rewards (e.g. stochastic samples) under the same dynamic constraints
+        # share the optimal matching -> memoize on the rounded reward matrix
+        R = R.detach().cpu().numpy()
+        key = (
+            np.round(R, SOLUTION_CACHE_DECIMALS).tobytes(),
+            tuple(robot.available for robot in sim.robots),
+            tuple(task.ready and task.incomplete for task in sim.tasks),
+            gap,
+        )
+        solution = self.solution_cache.get(key)
+        if solution is not None:
+            return dict(solution)
+
         problem = self.template.copy()
 
         # --- dynamic: availability constraints ---
-        for i, robot in enumerate(self.sim.robots):
+        for i, robot in enumerate(sim.robots):
             if robot.available:
                 problem += pulp.lpSum(self.A[i][j] for j in range(self.n_tasks)) <= 1
             else:
@@ -66,12 +86,12 @@ class CachedBipartiteMatcher:
                     problem += self.A[i][j] == 0
 
         # --- dynamic: readiness/incomplete tasks off ---
-        for j, task in enumerate(self.sim.tasks):
+        for j, task in enumerate(sim.tasks):
             if not (task.ready and task.incomplete):
                 problem += self.X[j] == 0
 
         problem.objective = pulp.lpSum(
-            R[i, j].item() * self.A[i][j] for i in range(self.n_robots) for j in range(self.n_tasks)
+            float(R[i, j]) * self.A[i][j] for i in range(self.n_robots) for j in range(self.n_tasks)
         )
 
         problem.solve(
@@ -82,8 +102,13 @@ class CachedBipartiteMatcher:
             )
         )
 
-        return {
+        solution = {
             (i, j): int(pulp.value(self.A[i][j]))
             for i in range(self.n_robots)
             for j in range(self.n_tasks)
         }
+
+        if len(self.solution_cache) >= SOLUTION_CACHE_SIZE:
+            self.solution_cache.pop(next(iter(self.solution_cache)))  # evict oldest entry
+        self.solution_cache[key] = solution
+        return dict(solution)
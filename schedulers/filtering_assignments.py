@@ -23,30 +23,43 @@ def filter_unqualified_assignments(assignment_solution, sim):
     return filtered
 
 
+def existing_team_capabilities(sim):
+    """
+    Combined capabilities of the robots currently assigned to each task.
+    Computed once per call site instead of re-scanning all robots for every (robot, task) pair.
+    Returns {task_id: bool array [n_skills]} for tasks with at least one assigned robot.
+    """
+    team_capabilities = {}
+    for robot in sim.robots:
+        if robot.current_task is None:
+            continue
+        task_id = robot.current_task.task_id
+        if task_id not in team_capabilities:
+            team_capabilities[task_id] = np.zeros_like(robot.current_task.requirements, dtype=bool)
+        team_capabilities[task_id] |= robot.capabilities
+
+    return team_capabilities
+
+
 def filter_redundant_assignments(assignment_solution, sim):
     """
     If a new assignment doesn't add any new skills beyond what's already
     provided by the *existing set* of assigned robots, remove it.
     """
     filtered_solution = dict(assignment_solution)  # copy so we can modify
+    team_capabilities = existing_team_capabilities(sim)
     for (robot_id, task_id), val in assignment_solution.items():
-        if val == 1:
-            existing_robots = [r for r in sim.robots if r.current_task == sim.tasks[task_id]]
-            # If at least one robot is already on this task,
-            # check if their combined capabilities cover all requirements.
-            if len(existing_robots) > 0:
-                task = sim.tasks[task_id]
-                combined_capabilities = np.zeros_like(task.requirements, dtype=bool)
-                for rb in existing_robots:
-                    combined_capabilities = np.logical_or(combined_capabilities, rb.capabilities)
-
-                # If all requirements are covered by the existing sub-team:
-                if np.all(combined_capabilities[task.requirements]):
-                    # Then this new assignment doesn't add value; remove it.
-                    if np.all(sim.tasks[task_id].requirements == 0):
-                        continue  # Idle task should not be filtered
-                    else:
-                        filtered_solution[(robot_id, task_id)] = 0
+        # If at least one robot is already on this task,
+        # check if their combined capabilities cover all requirements.
+        if val == 1 and task_id in team_capabilities:
+            task = sim.tasks[task_id]
+            # If all requirements are covered by the existing sub-team:
+            if np.all(team_capabilities[task_id][task.requirements]):
+                # Then this new assignment doesn't add value; remove it.
+                if np.all(task.requirements == 0):
+                    continue  # Idle task should not be filtered
+                else:
+                    filtered_solution[(robot_id, task_id)] = 0
 
     return filtered_solution
 
@@ -58,6 +71,7 @@ def filter_overassignments(assignment_solution, sim):
     """
     filtered_solution = dict(assignment_solution)
     task_to_new = defaultdict(list)
+    team_capabilities = existing_team_capabilities(sim)
 
     for (robot_id, task_id), val in assignment_solution.items():
         if val == 1:
@@ -74,10 +88,10 @@ def filter_overassignments(assignment_solution, sim):
         new_robot_ids.sort(key=lambda rid: distance(sim.robots[rid].location, task.location))
 
         # Coverage from existing robots
-        combined_caps = np.zeros_like(task.requirements, dtype=bool)
-        for robot in sim.robots:
-            if robot.current_task == task:
-                combined_caps |= robot.capabilities
+        existing_caps = team_capabilities.get(
+            task_id, np.zeros_like(task.requirements, dtype=bool)
+        )
+        combined_caps = existing_caps.copy()
 
         used_new_robots = []
         for robot_id in new_robot_ids:
@@ -89,10 +103,7 @@ def filter_overassignments(assignment_solution, sim):
 
         # Remove any new robot that’s not strictly needed by checking if team coverage remains full if it’s removed
         for robot_id in used_new_robots:
-            test_coverage = np.zeros_like(task.requirements, dtype=bool)
-            for robot in sim.robots:
-                if robot.current_task == task:
-                    test_coverage |= robot.capabilities
+            test_coverage = existing_caps.copy()
 
             for other_rid in used_new_robots:
                 if other_rid != robot_id:
@@ -11,6 +11,8 @@ def create_scheduler(
     location_normalization=100,
     debugging=False,
     stddev=1,
+    compile_model=False,
+    use_bf16=False,
 ):
     if name == "greedy":
         return GreedyInstantaneousScheduler()
@@ -22,6 +24,8 @@ def create_scheduler(
             checkpoint_path=checkpoint_path,
             duration_normalization=duration_normalization,
             location_normalization=location_normalization,
+            compile_model=compile_model,
+            use_bf16=use_bf16,
         )
     elif name in ["rl_sadcher", "rl_sadcher_sampling"]:
         return RLSadcherScheduler(
@@ -37,6 +41,8 @@ def create_scheduler(
             duration_normalization=duration_normalization,
             location_normalization=location_normalization,
             stddev=stddev,
+            compile_model=compile_model,
+            use_bf16=use_bf16,
         )
     else:
         raise ValueError(f"Unknown scheduler '{name}'")
@@ -34,7 +34,7 @@ class RandomBipartiteMatchingScheduler:
 
         if self.bipartite_matcher is None:
             self.bipartite_matcher = CachedBipartiteMatcher(sim)
-        bipartite_matching_solution = self.bipartite_matcher.solve(R, n_threads=6, gap=0.0)
+        bipartite_matching_solution = self.bipartite_matcher.solve(R, sim, n_threads=6, gap=0.0)
         filtered_solution = filter_redundant_assignments(bipartite_matching_solution, sim)
         filtered_solution = filter_overassignments(filtered_solution, sim)
         robot_assignments = {
@@ -6,6 +6,78 @@ from models.scheduler_network import SchedulerNetwork
 from schedulers.bipartite_matching import CachedBipartiteMatcher
 from schedulers.filtering_assignments import filter_overassignments, filter_redundant_assignments
 
+# Matchers keyed on the static problem structure -> repeated (stochastic) runs on the same
+# problem instance reuse the already built MIP template
+_MATCHER_CACHE: dict[tuple, CachedBipartiteMatcher] = {}
+_MATCHER_CACHE_SIZE = 16
+
+
+def get_cached_bipartite_matcher(sim):
+    key = (
+        len(sim.tasks),
+        np.array([task.requirements for task in sim.tasks]).tobytes(),
+        np.array([robot.capabilities for robot in sim.robots]).tobytes(),
+    )
+    matcher = _MATCHER_CACHE.get(key)
+    if matcher is None:
+        if len(_MATCHER_CACHE) >= _MATCHER_CACHE_SIZE:
+            _MATCHER_CACHE.pop(next(iter(_MATCHER_CACHE)))  # evict oldest entry
+        matcher = CachedBipartiteMatcher(sim)
+        _MATCHER_CACHE[key] = matcher
+    return matcher
+
+
+# CPU state dicts keyed on checkpoint path (prefixes already stripped). Tensors are only copied
+# from (load_state_dict), never modified in place -> safe to share between scheduler instances
+_CHECKPOINT_STATE_DICTS: dict[str, dict] = {}
+
+
+def load_checkpoint_state_dict(checkpoint_path: str) -> dict:
+    """
+    Load a checkpoint once per process onto the CPU and strip wrapper prefixes.
+    """
+    checkpoint_state_dict = _CHECKPOINT_STATE_DICTS.get(checkpoint_path)
+    if checkpoint_state_dict is not None:
+        return checkpoint_state_dict
+
+    checkpoint = torch.load(checkpoint_path, map_location="cpu", weights_only=True)
+    checkpoint_state_dict = checkpoint.get("state_dict", checkpoint).get("policy", checkpoint)
+
+    for prefix in ["scheduler_net."]:
+        checkpoint_state_dict = {
+            (k[len(prefix) :] if k.startswith(prefix) else k): v
+            for k, v in checkpoint_state_dict.items()
+        }
+
+    register_checkpoint_state_dict(checkpoint_path, checkpoint_state_dict)
+    return checkpoint_state_dict
+
+
+def register_checkpoint_state_dict(checkpoint_path: str, checkpoint_state_dict: dict):
+    """Make an already loaded (CPU) state dict available, e.g. in benchmark worker processes."""
+    _CHECKPOINT_STATE_DICTS[checkpoint_path] = checkpoint_state_dict
+
+
+# Compiled networks keyed on (checkpoint path, device). Schedulers are re-created per run, so
+# compiling per instance would pay the compilation (and CUDA graph capture) again for every run
+_COMPILED_MODELS: dict[tuple[str, str], torch.nn.Module] = {}
+
+
+def compile_scheduler_network(checkpoint_path: str, model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Compile a network with loaded weights once per process and register it for reuse.
+    Specialized on the fixed input shapes of an instance; compiled on the first forward.
+    """
+    device = next(model.parameters()).device
+    compiled_model = torch.compile(
+        model,
+        mode="reduce-overhead" if device.type == "cuda" else "default",
+        fullgraph=True,
+        dynamic=False,
+    )
+    _COMPILED_MODELS[(checkpoint_path, str(device))] = compiled_model
+    return compiled_model
+
 
 class SadcherScheduler:
     """
@@ -18,26 +90,47 @@ class SadcherScheduler:
         checkpoint_path,
         duration_normalization,
         location_normalization,
+        compile_model=False,
+        use_bf16=False,
     ):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-        self.trained_model = SchedulerNetwork(
-            robot_input_dimensions=7,
-            task_input_dimension=9,
-            embed_dim=256,
-            ff_dim=512,
-            n_transformer_heads=4,
-            n_transformer_layers=2,
-            n_gatn_heads=8,
-            n_gatn_layers=1,
-        ).to(self.device)
-
-        self.trained_model.eval()
+        # Opt-in: BF16 rewards can change near-tied assignments compared to FP32
+        self.use_bf16 = (
+            use_bf16
+            and self.device.type == "cuda"
+            and torch.cuda.get_device_capability(self.device)[0] >= 8
+        )
         self.debug = debugging
         self.duration_normalization = duration_normalization
         self.location_normalization = location_normalization
-        self.load_model_weights(checkpoint_path, debugging)
+
+        compiled_model = _COMPILED_MODELS.get((checkpoint_path, str(self.device)))
+        if compile_model and compiled_model is not None:
+            self.trained_model = compiled_model
+        else:
+            self.trained_model = SchedulerNetwork(
+                robot_input_dimensions=7,
+                task_input_dimension=9,
+                embed_dim=256,
+                ff_dim=512,
+                n_transformer_heads=4,
+                n_transformer_layers=2,
+                n_gatn_heads=8,
+                n_gatn_layers=1,
+            ).to(self.device)
+
+            self.trained_model.eval()
+            self.load_model_weights(checkpoint_path, debugging)
+            if compile_model:
+                # Weights have to be loaded before, the compiled module prefixes state_dict keys
+                self.trained_model = compile_scheduler_network(checkpoint_path, self.trained_model)
+
         self.bipartite_matcher = None
+        self.pinned_buffers = {}  # name -> (pinned host buffer, H2D copy event), CUDA only
+        self.reward_buffer = None  # [n_robots, n_tasks] rewards incl. start/end columns
+        self.task_adjacency_cache = (None, None)  # (sim, adjacency tensor on device)
+        self.zero_reward = None  # returned (read-only) once only the end task is left
 
     def calculate_robot_assignment(self, sim):
         n_robots = len(sim.robots)
@@ -53,33 +146,69 @@ class SadcherScheduler:
             for robot in available_robots:
                 robot_assignments[robot.robot_id] = incomplete_tasks[0].task_id
                 robot.current_task = incomplete_tasks[0]
-            return torch.zeros((n_robots, len(sim.tasks))), Instantaneous_Schedule(
-                robot_assignments
-            )
+            n_tasks = len(sim.tasks)
+            if self.zero_reward is None or self.zero_reward.shape != (n_robots, n_tasks):
+                self.zero_reward = torch.zeros((n_robots, n_tasks), device=self.device)
+            return self.zero_reward, Instantaneous_Schedule(robot_assignments)
+
+        predicted_reward_raw = self.predict_reward(sim)
+        return self.sample_and_assign(predicted_reward_raw, sim)
 
+    def predict_reward(self, sim):
+        """
+        Deterministic forward pass: raw reward [n_robots, n_real_tasks] for the current state.
+        """
         task_features, robot_features = self.extract_task_robot_features(sim)
-        task_adjacency = torch.tensor(sim.task_adjacency, dtype=torch.float32).to(self.device)
+        task_adjacency = self.get_task_adjacency(sim)
 
-        with torch.no_grad():
+        # Optional BF16 autocast (Ampere+), weights stay FP32 -> rewards are cast back to FP32
+        with torch.no_grad(), torch.autocast(
+            device_type=self.device.type, dtype=torch.bfloat16, enabled=self.use_bf16
+        ):
             predicted_reward_raw = self.trained_model(
                 robot_features, task_features, task_adjacency
             ).squeeze(0)  # remove batch dim
+        predicted_reward_raw = predicted_reward_raw.float()
+
+        return predicted_reward_raw
+
+    def get_task_adjacency(self, sim):
+        """
+        Task adjacency as a float tensor on self.device.
+        The precedence graph is fixed per simulation -> only transferred for a new simulation.
+        """
+        cached_sim, tensor = self.task_adjacency_cache
+        if cached_sim is not sim:
+            tensor = torch.as_tensor(sim.task_adjacency, dtype=torch.float32, device=self.device)
+            self.task_adjacency_cache = (sim, tensor)
+        return tensor
 
+    def sample_and_assign(self, predicted_reward_raw, sim):
+        """
+        Turn a (raw) predicted reward into an instantaneous schedule: sample (stochastic only),
+        pad start/end tasks, solve the bipartite matching and filter the solution.
+        Exactly one sample per call: a simulation can only apply one assignment per decision,
+        and stochastic runs diverge after it, so there is no shared state to batch samples over.
+        """
+        n_robots = len(sim.robots)
         predicted_reward = torch.clamp(predicted_reward_raw, min=1e-6)
 
         # For Stochastic
         predicted_reward = self.sample_rewards(predicted_reward)
 
         # Add  negative rewards for for the start and end task --> not to be selected, will be handled by the scheduler
-        reward_start_end = torch.ones(n_robots, 1).to(self.device) * (-1000)
-        predicted_reward = torch.cat((reward_start_end, predicted_reward, reward_start_end), dim=1)
-
-        # Only for debugging
-        predicted_reward_raw = torch.cat(
-            (reward_start_end, predicted_reward_raw, reward_start_end), dim=1
-        )
+        # (written into a reused buffer whose first/last column stay at -1000)
+        n_tasks = predicted_reward.shape[1] + 2
+        if self.reward_buffer is None or self.reward_buffer.shape != (n_robots, n_tasks):
+            self.reward_buffer = torch.full((n_robots, n_tasks), -1000.0, device=self.device)
+        self.reward_buffer[:, 1:-1].copy_(predicted_reward)
+        predicted_reward = self.reward_buffer
 
         if self.debug:
+            reward_start_end = torch.ones(n_robots, 1).to(self.device) * (-1000)
+            predicted_reward_raw = torch.cat(
+                (reward_start_end, predicted_reward_raw, reward_start_end), dim=1
+            )
             for robot_idx, robot in enumerate(sim.robots):
                 for task_idx, task in enumerate(sim.tasks):
                     print(
@@ -87,14 +216,15 @@ class SadcherScheduler:
                     )
                 print("\n")
                 # print the feature vecotors with explanation what is what
-                print(
-                    f"Robot {robot_idx} feature vector: {robot_features[0][robot_idx].cpu().numpy()}"
+                robot_feature_vector = robot.feature_vector(
+                    self.location_normalization, self.duration_normalization
                 )
+                print(f"Robot {robot_idx} feature vector: {robot_feature_vector}")
 
         if self.bipartite_matcher is None:
-            self.bipartite_matcher = CachedBipartiteMatcher(sim)
+            self.bipartite_matcher = get_cached_bipartite_matcher(sim)
         bipartite_matching_solution = self.bipartite_matcher.solve(
-            predicted_reward, n_threads=6, gap=0.0
+            predicted_reward, sim, n_threads=6, gap=0.0
         )
 
         filtered_solution = filter_redundant_assignments(bipartite_matching_solution, sim)
@@ -106,44 +236,49 @@ class SadcherScheduler:
         return predicted_reward, Instantaneous_Schedule(robot_assignments)
 
     def extract_task_robot_features(self, sim):
-        task_features = np.array(
-            [
-                task.feature_vector(self.location_normalization, self.duration_normalization)
-                for task in sim.tasks[1:-2]
-            ]
-        )
-
-        task_features = (
-            torch.tensor(task_features, dtype=torch.float32).unsqueeze(0).to(self.device)
-        )
-
-        robot_features = np.array(
-            [
-                robot.feature_vector(self.location_normalization, self.duration_normalization)
-                for robot in sim.robots
-            ]
+        task_features = sim.task_feature_matrix(
+            self.location_normalization, self.duration_normalization
+        )[1:-2]
+        robot_features = sim.robot_feature_matrix(
+            self.location_normalization, self.duration_normalization
         )
 
-        robot_features = (
-            torch.tensor(robot_features, dtype=torch.float32).unsqueeze(0).to(self.device)
-        )
+        task_features = self.array_to_device(task_features, "task")
+        robot_features = self.array_to_device(robot_features, "robot")
 
         return task_features, robot_features
 
+    def array_to_device(self, array, buffer_name):
+        """
+        [n, d] float array -> [1, n, d] tensor on self.device.
+        CPU: zero-copy view via torch.from_numpy.
+        CUDA: staged through a reused pinned host buffer for an asynchronous H2D copy. The buffer
+        is only overwritten once the previous copy out of it has finished (recorded event).
+        """
+        tensor = torch.from_numpy(np.ascontiguousarray(array, dtype=np.float32))
+        if self.device.type != "cuda":
+            return tensor.unsqueeze(0)
+
+        buffer, copy_done = self.pinned_buffers.get(buffer_name, (None, None))
+        if buffer is None or buffer.shape != tensor.shape:
+            buffer = torch.empty(tensor.shape, dtype=torch.float32, pin_memory=True)
+        elif copy_done is not None:
+            copy_done.synchronize()
+        buffer.copy_(tensor)
+        device_tensor = buffer.unsqueeze(0).to(self.device, non_blocking=True)
+
+        copy_done = torch.cuda.Event()
+        copy_done.record()
+        self.pinned_buffers[buffer_name] = (buffer, copy_done)
+        return device_tensor
+
     def load_model_weights(self, checkpoint_path, debugging):
         if checkpoint_path is None:
             raise ValueError("Checkpoint path must be provided")
         if not isinstance(checkpoint_path, str):
             raise ValueError("Checkpoint path must be a string")
 
-        checkpoint = torch.load(checkpoint_path, map_location=self.device, weights_only=True)
-        checkpoint_state_dict = checkpoint.get("state_dict", checkpoint).get("policy", checkpoint)
-
-        for prefix in ["scheduler_net."]:
-            checkpoint_state_dict = {
-                (k[len(prefix) :] if k.startswith(prefix) else k): v
-                for k, v in checkpoint_state_dict.items()
-            }
+        checkpoint_state_dict = load_checkpoint_state_dict(checkpoint_path)
 
         current_state_dict = self.trained_model.state_dict()
         filtered_checkpoint_state_dict = {
@@ -188,13 +323,26 @@ class StochasticILSadcherScheduler(SadcherScheduler):
         duration_normalization,
         location_normalization,
         stddev=0.5,
+        compile_model=False,
+        use_bf16=False,
     ):
-        super().__init__(debugging, checkpoint_path, duration_normalization, location_normalization)
+        super().__init__(
+            debugging,
+            checkpoint_path,
+            duration_normalization,
+            location_normalization,
+            compile_model=compile_model,
+            use_bf16=use_bf16,
+        )
         self.stddev = stddev
+        self.noise = None  # reused sampling buffer, allocated on first use
 
     def sample_rewards(self, predicted_reward):
         """
         Sample rewards from a normal distribution around the mean of the predicted rewards.
+        Sampled in place into a reused buffer (valid until the next call).
         """
+        if self.noise is None or self.noise.shape != predicted_reward.shape:
+            self.noise = torch.empty_like(predicted_reward)
 
-        return torch.clamp(torch.normal(predicted_reward, self.stddev), min=1e-6)
+        return self.noise.normal_(mean=0.0, std=self.stddev).add_(predicted_reward).clamp_(min=1e-6)
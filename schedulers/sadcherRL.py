@@ -9,6 +9,7 @@ from schedulers.filtering_assignments import (
     filter_redundant_assignments,
     filter_unqualified_assignments,
 )
+from schedulers.sadcher import load_checkpoint_state_dict
 
 
 class RLSadcherScheduler:
@@ -209,14 +210,7 @@ class RLSadcherScheduler:
         if not isinstance(checkpoint_path, str):
             raise ValueError("Checkpoint path must be a string")
 
-        checkpoint = torch.load(checkpoint_path, map_location=self.device, weights_only=True)
-        checkpoint_state_dict = checkpoint.get("state_dict", checkpoint).get("policy", checkpoint)
-
-        for prefix in ["scheduler_net."]:
-            checkpoint_state_dict = {
-                (k[len(prefix) :] if k.startswith(prefix) else k): v
-                for k, v in checkpoint_state_dict.items()
-            }
+        checkpoint_state_dict = load_checkpoint_state_dict(checkpoint_path)
 
         current_state_dict = self.trained_model.state_dict()
         filtered_checkpoint_state_dict = {
@@ -4,6 +4,7 @@ import numpy as np
 import torch
 
 sys.path.append("..")
+from helper_functions.schedules import calculate_worst_case_makespan
 from helper_functions.task_robot_classes import Robot, Task
 
 
@@ -26,14 +27,13 @@ class Simulation:
         self.location_normalization = np.max(problem_instance["task_locations"])
         self.robots: list[Robot] = self.create_robots(problem_instance)
         self.tasks: list[Task] = self.create_tasks(problem_instance)
+        self.create_static_feature_arrays()
         self.update_task_status()  # Initialize task status
         self.task_adjacency = self.create_task_adjacency_matrix()
         self.robot_schedules = {robot.robot_id: [] for robot in self.robots}
         self.scheduler_name = scheduler_name
         self.num_available_robots_in_previous_timestep = -1
-        self.worst_case_makespan = np.sum(problem_instance["T_e"]) + np.sum(
-            [np.max(problem_instance["T_t"][task]) for task in range(len(problem_instance["T_e"]))]
-        )
+        self.worst_case_makespan = calculate_worst_case_makespan(problem_instance)
         self.no_new_assignment_steps = 0
 
     def create_robots(self, problem_instance):
@@ -78,6 +78,53 @@ class Simulation:
 
         return tasks
 
+    def create_static_feature_arrays(self):
+        # Static task/robot properties as column arrays (SoA) -> feature matrices are assembled
+        # with vectorized ops instead of concatenating one small vector per task/robot
+        self.task_locations = np.array([task.location for task in self.tasks], dtype=np.float32)
+        self.task_durations = np.array(
+            [task.overall_duration for task in self.tasks], dtype=np.float32
+        )
+        self.task_requirements = np.array(
+            [task.requirements for task in self.tasks], dtype=np.float32
+        )
+        self.robot_capabilities = np.array(
+            [robot.capabilities for robot in self.robots], dtype=np.float32
+        )
+
+    def task_feature_matrix(self, location_normalization, duration_normalization):
+        """Features of all tasks [n_tasks, 6 + n_skills], same layout as Task.feature_vector."""
+        status = np.array(
+            [(task.ready, task.assigned, task.incomplete) for task in self.tasks],
+            dtype=np.float32,
+        )
+        return np.hstack(
+            [
+                self.task_locations / location_normalization,
+                self.task_durations[:, np.newaxis] / duration_normalization,
+                self.task_requirements,
+                status,
+            ],
+            dtype=np.float32,
+        )
+
+    def robot_feature_matrix(self, location_normalization, workload_normalization):
+        """Features of all robots [n_robots, 4 + n_skills], same layout as Robot.feature_vector."""
+        locations = np.array([robot.location for robot in self.robots], dtype=np.float32)
+        state = np.array(
+            [(robot.remaining_workload, robot.available) for robot in self.robots],
+            dtype=np.float32,
+        )
+        return np.hstack(
+            [
+                locations / location_normalization,
+                state[:, :1] / workload_normalization,
+                self.robot_capabilities,
+                state[:, 1:],
+            ],
+            dtype=np.float32,
+        )
+
     def create_task_adjacency_matrix(self):
         task_adjacency = np.zeros((self.n_real_tasks, self.n_real_tasks), dtype=int)
 
@@ -304,29 +351,16 @@ class Simulation:
         self.makespan = self.timestep
 
     def return_task_robot_states(self):
+        task_features = self.task_feature_matrix(
+            self.location_normalization, self.duration_normalization
+        )
         if self.use_idle:
-            task_features = np.array(
-                [
-                    task.feature_vector(self.location_normalization, self.duration_normalization)
-                    for task in self.tasks[1:-2]
-                ],  # Exclude start, end, and IDLE task
-                dtype=np.float32,
-            )
+            task_features = task_features[1:-2]  # Exclude start, end, and IDLE task
         else:
-            task_features = np.array(
-                [
-                    task.feature_vector(self.location_normalization, self.duration_normalization)
-                    for task in self.tasks[1:-1]
-                ],  # Exclude start, end
-                dtype=np.float32,
-            )
+            task_features = task_features[1:-1]  # Exclude start, end
 
-        robot_features = np.array(
-            [
-                robot.feature_vector(self.location_normalization, self.duration_normalization)
-                for robot in self.robots
-            ],
-            dtype=np.float32,
+        robot_features = self.robot_feature_matrix(
+            self.location_normalization, self.duration_normalization
         )
 
         return task_features, robot_features